@@ -0,0 +1,214 @@
+import sqlite3
+import collections
+import os
+import random
+import tempfile
+import time
+import statistics
+import dedup
+
+
+# Benchmark settings
+NUM_ROWS = 1_000_000
+NUM_PROBES = 10_000
+NUM_SCAN_PROBES = 20
+RELIST_RATE = 0.05  # Share of rows that are relistings of an earlier row
+
+MAKES = ["TOYOTA", "LEXUS", "HONDA", "NISSAN", "SUBARU", "MAZDA", "SUZUKI"]
+COLOURS = ["WHITE", "BLACK", "SILVER", "GREY", "BLUE", "RED", "PEARL", "GREEN"]
+
+
+def generate_rows(num_rows, seed=0):
+    """
+    Generate synthetic vehicle rows, some of them relistings of earlier rows.
+    Each row records the car it lists under "Car", and a relisted car's
+    previous listing is marked sold, as check_db would.
+    """
+    rng = random.Random(seed)
+    models = [
+        (f"{make} MODEL{i}", f"MC{i:03d}{make[:2]}", f"EC{i % 40:02d}", 1 + i % 30 / 10)
+        for make in MAKES
+        for i in range(70)
+    ]
+    rows = []
+    latest = {}  # Car -> index of its most recent listing
+
+    for i in range(num_rows):
+        if rows and rng.random() < RELIST_RATE:
+            # Relisted under a new ref_no with a few more km on the clock
+            previous = rows[latest[rows[rng.randrange(len(rows))]["Car"]]]
+            previous["Status"] = "sold"
+            mileage = previous["Mileage"] + rng.randint(0, 1500)
+            vehicle_data = dict(
+                previous,
+                **{"Ref No": f"R{i:07d}", "Mileage": mileage, "Status": "available"},
+            )
+        else:
+            title, model_code, engine_code, engine_size = rng.choice(models)
+            vehicle_data = {
+                "Ref No": f"R{i:07d}",
+                "Car": i,
+                "Title": title,
+                "Model Code": model_code,
+                "Engine Code": engine_code,
+                "Engine Size": engine_size,
+                "Transmission": rng.choices(["AT", "MT"], [85, 15])[0],
+                "Drive": rng.choices(["2WD", "4WD"], [70, 30])[0],
+                "Doors": rng.choice([4, 5]),
+                "Year": rng.randint(1995, 2009),
+                "Colour": rng.choice(COLOURS),
+                "Mileage": rng.randint(0, 250_000),
+                "Status": "available",
+            }
+        latest[vehicle_data["Car"]] = i
+        rows.append(vehicle_data)
+
+    return rows
+
+
+def create_table(conn, rows):
+    """Create a vehicles table holding the columns the dedup index uses"""
+    conn.execute(
+        """
+        CREATE TABLE vehicles (
+            ref_no TEXT PRIMARY KEY,
+            year INTEGER,
+            title TEXT,
+            mileage INTEGER,
+            engine_size INTEGER,
+            engine_code TEXT,
+            model_code TEXT,
+            transmission TEXT,
+            drive TEXT,
+            doors INTEGER,
+            colour TEXT,
+            status TEXT,
+            dedup_key TEXT,
+            canonical_id TEXT
+        )"""
+    )
+    conn.executemany(
+        """
+        INSERT INTO vehicles (
+            ref_no, year, title, mileage, engine_size, engine_code, model_code,
+            transmission, drive, doors, colour, status, dedup_key, canonical_id
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        (
+            (
+                vehicle_data["Ref No"],
+                vehicle_data["Year"],
+                vehicle_data["Title"],
+                vehicle_data["Mileage"],
+                vehicle_data["Engine Size"],
+                vehicle_data["Engine Code"],
+                vehicle_data["Model Code"],
+                vehicle_data["Transmission"],
+                vehicle_data["Drive"],
+                vehicle_data["Doors"],
+                vehicle_data["Colour"],
+                vehicle_data["Status"],
+                dedup.compute_dedup_key(vehicle_data),
+                vehicle_data["Ref No"],
+            )
+            for vehicle_data in rows
+        ),
+    )
+    conn.commit()
+
+
+def percentile(samples, pct):
+    """Return the pct-th percentile of samples"""
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+def run_benchmark():
+    """
+    Time candidate generation with the dedup index against a full scan, and
+    measure link precision and recall against the known relistings.
+    """
+    rows = generate_rows(NUM_ROWS)
+    probes = random.Random(1).sample(rows, NUM_PROBES)
+    car_of = {vehicle_data["Ref No"]: vehicle_data["Car"] for vehicle_data in rows}
+
+    # A probe should be linked when another listing of its car has ended
+    ended_listings = collections.Counter(
+        vehicle_data["Car"] for vehicle_data in rows if vehicle_data["Status"] == "sold"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        conn = sqlite3.connect(os.path.join(tmp_dir, "bench.db"))
+        cursor = conn.cursor()
+
+        start = time.perf_counter()
+        create_table(conn, rows)
+        print(f"Loaded {NUM_ROWS:,} rows in {time.perf_counter() - start:.1f}s")
+
+        start = time.perf_counter()
+        dedup.setup_dedup_index(cursor)
+        conn.commit()
+        print(f"Built dedup index in {time.perf_counter() - start:.1f}s")
+
+        timings = []
+        matches = 0
+        correct = 0
+        relistings = 0
+        for vehicle_data in probes:
+            start = time.perf_counter()
+            canonical_id = dedup.find_canonical_id(
+                cursor,
+                vehicle_data["Ref No"],
+                dedup.compute_dedup_key(vehicle_data),
+                vehicle_data["Mileage"],
+            )
+            timings.append((time.perf_counter() - start) * 1000)
+
+            ended = ended_listings[vehicle_data["Car"]]
+            relistings += ended - (vehicle_data["Status"] == "sold") > 0
+            matches += canonical_id is not None
+            correct += canonical_id is not None and (
+                car_of[canonical_id] == vehicle_data["Car"]
+            )
+
+        print(
+            f"Indexed lookup ({NUM_PROBES:,} probes): "
+            f"mean {statistics.mean(timings):.3f} ms, "
+            f"p50 {percentile(timings, 50):.3f} ms, "
+            f"p99 {percentile(timings, 99):.3f} ms"
+        )
+        print(
+            f"Links: {matches:,} probes with a candidate, {correct:,} correct, "
+            f"{relistings:,} with an ended listing of the same car; "
+            f"precision {correct / max(matches, 1):.1%}, "
+            f"recall {correct / max(relistings, 1):.1%}"
+        )
+
+        # Same lookup without the index, i.e. comparing against every row
+        timings = []
+        for vehicle_data in probes[:NUM_SCAN_PROBES]:
+            start = time.perf_counter()
+            cursor.execute(
+                """
+                SELECT COALESCE(canonical_id, ref_no) FROM vehicles NOT INDEXED
+                WHERE dedup_key = ? AND mileage BETWEEN ? AND ? AND ref_no != ?
+                AND status != 'available'
+                ORDER BY rowid LIMIT 1""",
+                (
+                    dedup.compute_dedup_key(vehicle_data),
+                    vehicle_data["Mileage"] - dedup.MILEAGE_TOLERANCE,
+                    vehicle_data["Mileage"] + dedup.MILEAGE_TOLERANCE,
+                    vehicle_data["Ref No"],
+                ),
+            )
+            cursor.fetchone()
+            timings.append((time.perf_counter() - start) * 1000)
+
+        print(
+            f"Full scan lookup ({NUM_SCAN_PROBES} probes): "
+            f"mean {statistics.mean(timings):.1f} ms"
+        )
+        conn.close()
+
+
+if __name__ == "__main__":
+    run_benchmark()
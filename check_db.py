@@ -1,9 +1,6 @@
 import sqlite3
 import logging
 from selenium.common.exceptions import WebDriverException, TimeoutException
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
 import os
 from selenium.webdriver.chrome.options import Options
 from selenium import webdriver
@@ -13,6 +10,7 @@ import time
 
 # import json
 from fake_useragent import UserAgent
+from sites import DEFAULT_SITE, get_site_adapter
 
 
 load_dotenv()
@@ -92,39 +90,66 @@ def fetch_page(driver, link):
         return False
 
 
-def check_vehicle_status(driver, link):
+def check_vehicle_status(driver, link, site):
     """Check the current status of the vehicle on the website."""
     if not fetch_page(driver, link):
         return None  # Unable to determine status
 
     try:
-        price_element = WebDriverWait(driver, 5).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "p.total-price"))
-        )
-        price = price_element.text.strip().upper()
-
-        return "SOLD" not in price and "UNDER OFFER" not in price and price != "ASK"
+        return site.detect_status(driver)
 
     except TimeoutException:
         logging.info(f"No price information found for {link}")
 
-        return True  # Vehicle is still available
+        return "available"  # Vehicle is still available
 
 
 def update_db(driver):
-    """Update database to remove vehicles that are no longer available or have been sold"""
+    """Update the status of vehicles that are no longer available or have been sold"""
     conn = sqlite3.connect("vehicles.db")
     cursor = conn.cursor()
-    cursor.execute("SELECT ref_no, link FROM vehicles")
-
-    for ref_no, link in cursor.fetchall():
-        if not check_vehicle_status(driver, link):
-            logging.info(
-                f"Vehicle {ref_no} has been sold or is under offer. Removing from database."
-            )
-            cursor.execute("DELETE FROM vehicles WHERE ref_no = ?", (ref_no,))
-        else:
-            logging.info(f"Vehicle {ref_no} is still available.")
+
+    # Sold vehicles stay in the table so relistings can be linked to them and
+    # aren't sent to Discord again; they just don't need checking any more
+    cursor.execute(
+        """
+        SELECT ref_no, link, COALESCE(source, ?), status FROM vehicles
+        WHERE status != 'sold'""",
+        (DEFAULT_SITE,),
+    )
+
+    # Status detection only needs the adapter's selectors, not its crawl settings
+    sites = {}
+    detected_at = datetime.datetime.now().isoformat(timespec="seconds")
+
+    for ref_no, link, source, old_status in cursor.fetchall():
+        if source not in sites:
+            sites[source] = get_site_adapter(source)(base_url=None, num_pages=0)
+
+        status = check_vehicle_status(driver, link, sites[source])
+
+        if status is None:
+            logging.info(f"Could not check vehicle {ref_no}, keeping it as is.")
+            continue
+
+        if status == old_status:
+            logging.info(f"Vehicle {ref_no} is still {status}.")
+            continue
+
+        logging.info(f"Vehicle {ref_no} is now {status}. Updating database.")
+        # Clear the content hash, which covers the old status, so the scraper
+        # rewrites the row if the vehicle shows up as available again
+        cursor.execute(
+            "UPDATE vehicles SET status = ?, content_hash = NULL WHERE ref_no = ?",
+            (status, ref_no),
+        )
+        cursor.execute(
+            """
+            INSERT INTO vehicle_changes (
+                ref_no, change_type, old_value, new_value, detected_at
+            ) VALUES (?, 'status_changed', ?, ?, ?)""",
+            (ref_no, old_status, status, detected_at),
+        )
     conn.commit()
     conn.close()
 
@@ -0,0 +1,145 @@
+import sqlite3
+import logging
+import hashlib
+import re
+import os
+from dotenv import load_dotenv
+
+
+# Relisted vehicles can show slightly different mileage between listings
+MILEAGE_TOLERANCE = 2000  # km either side
+
+# Fields a relisted vehicle keeps identical; used as the blocking key
+BLOCKING_FIELDS = [
+    "Model Code",
+    "Engine Code",
+    "Engine Size",
+    "Transmission",
+    "Drive",
+    "Doors",
+    "Year",
+    "Colour",
+    "Title",
+]
+
+
+def normalize_text(value):
+    """Uppercase and strip punctuation / extra whitespace for comparison"""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)  # SQLite stores 2.0 in an INTEGER column as 2
+    return " ".join(re.sub(r"[^0-9A-Z]+", " ", str(value).upper()).split())
+
+
+def parse_mileage(value):
+    """Return mileage as an int, or None if it can't be parsed"""
+    try:
+        return int(float(str(value).replace(",", "").replace("km", "")))
+    except (TypeError, ValueError):
+        return None
+
+
+def compute_dedup_key(vehicle_data):
+    """
+    Build the blocking key for a vehicle. Returns None when neither model code
+    nor engine code is known, as the remaining fields are too coarse to block on.
+    """
+    model_code = normalize_text(vehicle_data.get("Model Code"))
+    engine_code = normalize_text(vehicle_data.get("Engine Code"))
+
+    if not model_code and not engine_code:
+        return None
+
+    key = "|".join(normalize_text(vehicle_data.get(field)) for field in BLOCKING_FIELDS)
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def setup_dedup_index(cursor):
+    """Create the index used for candidate lookups and re-alert suppression"""
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_vehicles_dedup ON vehicles (dedup_key, mileage)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_vehicles_canonical ON vehicles (canonical_id)"
+    )
+
+
+def find_canonical_id(cursor, ref_no, dedup_key, mileage):
+    """
+    Look up an ended listing in the same block within the mileage tolerance
+    and return its canonical id, or None if there is no candidate. A car that
+    is still listed as available can't be relisted, so it is never a match.
+    """
+    if dedup_key is None or mileage is None:
+        return None
+
+    cursor.execute(
+        """
+        SELECT COALESCE(canonical_id, ref_no) FROM vehicles
+        WHERE dedup_key = ? AND mileage BETWEEN ? AND ? AND ref_no != ?
+        AND status != 'available'
+        ORDER BY rowid LIMIT 1""",
+        (dedup_key, mileage - MILEAGE_TOLERANCE, mileage + MILEAGE_TOLERANCE, ref_no),
+    )
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def link_vehicle(cursor, vehicle_data):
+    """
+    Set "Dedup Key" and "Canonical Id" on vehicle_data. A vehicle with no
+    duplicate candidate is its own canonical vehicle.
+    """
+    dedup_key = compute_dedup_key(vehicle_data)
+    canonical_id = find_canonical_id(
+        cursor,
+        vehicle_data["Ref No"],
+        dedup_key,
+        parse_mileage(vehicle_data.get("Mileage")),
+    )
+
+    if canonical_id is not None:
+        logging.info(
+            f"Vehicle {vehicle_data['Ref No']} looks like a relisting of {canonical_id}."
+        )
+
+    vehicle_data["Dedup Key"] = dedup_key
+    vehicle_data["Canonical Id"] = canonical_id or vehicle_data["Ref No"]
+    return vehicle_data
+
+
+def rebuild_dedup_index(conn):
+    """Recompute dedup keys and canonical ids for every vehicle, oldest first"""
+    cursor = conn.cursor()
+    setup_dedup_index(cursor)
+    cursor.execute("UPDATE vehicles SET dedup_key = NULL, canonical_id = NULL")
+
+    fields = ["Ref No", "Mileage"] + BLOCKING_FIELDS
+    columns = ", ".join(field.lower().replace(" ", "_") for field in fields)
+    rows = conn.execute(f"SELECT {columns} FROM vehicles ORDER BY rowid").fetchall()
+
+    linked = 0
+    for row in rows:
+        ref_no = row[0]
+        vehicle_data = link_vehicle(cursor, dict(zip(fields, row)))
+        if vehicle_data["Canonical Id"] != ref_no:
+            linked += 1
+
+        cursor.execute(
+            "UPDATE vehicles SET dedup_key = ?, canonical_id = ? WHERE ref_no = ?",
+            (vehicle_data["Dedup Key"], vehicle_data["Canonical Id"], ref_no),
+        )
+
+    conn.commit()
+    logging.info(f"Dedup index rebuilt, {linked} vehicles linked to a relisting.")
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
+    with sqlite3.connect(os.getenv("DB_FILE", "vehicles.db")) as conn:
+        rebuild_dedup_index(conn)
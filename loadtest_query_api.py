@@ -0,0 +1,96 @@
+import argparse
+import asyncio
+import random
+import time
+from query_api import QUERY_API_HOST, QUERY_API_PORT
+
+
+# Query strings the load test picks from, mimicking bot and dashboard usage
+QUERIES = [
+    "/vehicles",
+    "/vehicles?make=TOYOTA",
+    "/vehicles?make=HONDA&max_price=8000",
+    "/vehicles?make=NISSAN&max_mileage=120000",
+    "/vehicles?location=Kobe&grade=4",
+    "/vehicles?min_price=3000&max_price=10000&limit=20",
+    "/vehicles?make=SUBARU&location=Osaka",
+    "/vehicles?grade=3.5&max_mileage=150000",
+    "/vehicles?make=MAZDA&min_mileage=50000&max_mileage=100000",
+    "/vehicles?location=Yokohama&max_price=15000&limit=100",
+]
+
+
+def percentile(samples, pct):
+    """Return the pct-th percentile of samples"""
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+async def send_request(reader, writer, host, target):
+    """Send one keep-alive GET request and return the status code"""
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    content_length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            content_length = int(value)
+
+    await reader.readexactly(content_length)
+    return status
+
+
+async def run_client(host, port, num_requests, latencies, errors, rng):
+    """Issue num_requests requests over one connection, recording latencies"""
+    reader, writer = await asyncio.open_connection(host, port)
+
+    try:
+        for _ in range(num_requests):
+            start = time.perf_counter()
+            status = await send_request(reader, writer, host, rng.choice(QUERIES))
+            latencies.append((time.perf_counter() - start) * 1000)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run_load_test(host, port, concurrency, requests_per_client):
+    """Run concurrent clients against the query API and print latency stats"""
+    latencies = []
+    errors = []
+    rng = random.Random(0)
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            run_client(host, port, requests_per_client, latencies, errors, rng)
+            for _ in range(concurrency)
+        )
+    )
+    elapsed = time.perf_counter() - start
+
+    print(f"Requests: {len(latencies):,} from {concurrency} concurrent clients")
+    print(f"Throughput: {len(latencies) / elapsed:,.0f} requests/s")
+    print(
+        f"Latency: p50 {percentile(latencies, 50):.2f} ms, "
+        f"p99 {percentile(latencies, 99):.2f} ms, "
+        f"max {max(latencies):.2f} ms"
+    )
+    print(f"Errors: {len(errors)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the local query API")
+    parser.add_argument("--host", default=QUERY_API_HOST)
+    parser.add_argument("--port", type=int, default=QUERY_API_PORT)
+    parser.add_argument("--concurrency", type=int, default=300)
+    parser.add_argument("--requests", type=int, default=50, help="Per client")
+    args = parser.parse_args()
+
+    asyncio.run(run_load_test(args.host, args.port, args.concurrency, args.requests))
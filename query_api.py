@@ -0,0 +1,340 @@
+import asyncio
+import base64
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+from dotenv import load_dotenv
+import search_index
+from query_indexes import MAKE_SQL
+
+
+load_dotenv()
+DB_FILE = os.getenv("DB_FILE", "vehicles.db")
+QUERY_API_HOST = os.getenv("QUERY_API_HOST", "127.0.0.1")
+QUERY_API_PORT = int(os.getenv("QUERY_API_PORT", 8080))
+CACHE_TTL = int(os.getenv("QUERY_CACHE_TTL", 30))  # Seconds a cached result lives
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+MAX_CACHE_ENTRIES = 1024
+QUERY_THREADS = 8
+
+# Columns returned for each vehicle
+RESULT_COLUMNS = [
+    "ref_no",
+    "year",
+    "title",
+    "mileage",
+    "engine_size",
+    "engine_code",
+    "model_code",
+    "transmission",
+    "drive",
+    "steering",
+    "doors",
+    "seats",
+    "fuel_type",
+    "auction_grade",
+    "total_price",
+    "link",
+    "colour",
+    "location",
+    "status",
+    "source",
+]
+
+# Query string filters mapped to their SQL condition
+FILTERS = {
+    "make": (f"{MAKE_SQL} = ?", lambda value: value.strip().upper()),
+    "min_price": ("total_price >= ?", float),
+    "max_price": ("total_price <= ?", float),
+    "min_mileage": ("mileage >= ?", int),
+    "max_mileage": ("mileage <= ?", int),
+    "location": ("location = ?", str),
+    "grade": ("auction_grade = ?", str),
+}
+
+
+class QueryError(Exception):
+    """Raised for invalid query parameters, reported as a 400 response"""
+
+
+def encode_cursor(total_price, ref_no):
+    """Encode the sort key of the last row on a page as an opaque cursor"""
+    raw = json.dumps([total_price, ref_no]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor):
+    """Decode a cursor made by encode_cursor"""
+    try:
+        total_price, ref_no = json.loads(base64.urlsafe_b64decode(cursor))
+        return float(total_price), str(ref_no)
+    except (ValueError, TypeError):
+        raise QueryError("Invalid cursor")
+
+
+def build_vehicle_query(params):
+    """
+    Build the SQL for a vehicle search from parsed query parameters. Results
+    are ordered by (total_price, ref_no) and paged by keyset on that key.
+    """
+    conditions = ["status = 'available'"]
+    args = []
+
+    for name, (condition, convert) in FILTERS.items():
+        value = params.get(name)
+        if value:
+            try:
+                args.append(convert(value))
+            except ValueError:
+                raise QueryError(f"Invalid value for {name}: {value!r}")
+            conditions.append(condition)
+
+    after = params.get("after")
+    if after:
+        conditions.append("(total_price, ref_no) > (?, ?)")
+        args.extend(decode_cursor(after))
+
+    try:
+        limit = int(params.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise QueryError(f"Invalid value for limit: {params['limit']!r}")
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    sql = f"""
+        SELECT {", ".join(RESULT_COLUMNS)} FROM vehicles
+        WHERE {" AND ".join(conditions)}
+        ORDER BY total_price, ref_no
+        LIMIT ?"""
+    args.append(limit)
+    return sql, args, limit
+
+
+class VehicleQueryService:
+    """Runs read-only vehicle queries with a TTL cache invalidated on writes"""
+
+    def __init__(self, db_file, cache_ttl=CACHE_TTL):
+        self.db_file = db_file
+        self.cache_ttl = cache_ttl
+        self.cache = {}
+        self.pending = {}  # Queries in flight, shared by identical requests
+        self.local = threading.local()
+        self.executor = ThreadPoolExecutor(max_workers=QUERY_THREADS)
+
+        # PRAGMA data_version changes when another connection commits
+        self.version_conn = self.connect()
+        self.data_version = self.read_data_version()
+
+    def connect(self):
+        """Open a read-only connection to the database"""
+        return sqlite3.connect(
+            f"file:{self.db_file}?mode=ro", uri=True, check_same_thread=False
+        )
+
+    def read_data_version(self):
+        """Return the database's current data version"""
+        return self.version_conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def thread_connection(self):
+        """Return the calling worker thread's connection"""
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = self.local.conn = self.connect()
+        return conn
+
+    def run_query(self, params):
+        """Run a vehicle query and return the JSON response body"""
+        sql, args, limit = build_vehicle_query(params)
+        rows = self.thread_connection().execute(sql, args).fetchall()
+        vehicles = [dict(zip(RESULT_COLUMNS, row)) for row in rows]
+
+        next_cursor = None
+        if len(vehicles) == limit:
+            last = vehicles[-1]
+            next_cursor = encode_cursor(last["total_price"], last["ref_no"])
+
+        return json.dumps({"vehicles": vehicles, "next": next_cursor}).encode("utf-8")
+
+    def run_search(self, params):
+        """Run a full-text search and return the JSON response body"""
+        text = params.get("q", "")
+        if not search_index.build_match_query(text):
+            raise QueryError("Missing search text q")
+
+        try:
+            limit = max(
+                1, min(int(params.get("limit", DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+            )
+        except ValueError:
+            raise QueryError(f"Invalid value for limit: {params['limit']!r}")
+
+        rows = search_index.search_vehicles(
+            self.thread_connection().cursor(), text, RESULT_COLUMNS, limit
+        )
+        vehicles = [dict(zip(RESULT_COLUMNS, row)) for row in rows]
+        return json.dumps({"vehicles": vehicles}).encode("utf-8")
+
+    def run_facets(self, params):
+        """Return facet counts (one facet, or all of them) as the JSON response body"""
+        facets = list(search_index.FACETS)
+        if params.get("facet"):
+            if params["facet"] not in search_index.FACETS:
+                raise QueryError(f"Unknown facet, expected one of {facets}")
+            facets = [params["facet"]]
+
+        cursor = self.thread_connection().cursor()
+        counts = {
+            facet: dict(search_index.facet_counts(cursor, facet)) for facet in facets
+        }
+        return json.dumps(counts).encode("utf-8")
+
+    async def fetch(self, path, params):
+        """Return the response body for a request, from the cache when possible"""
+        data_version = self.read_data_version()
+        if data_version != self.data_version:
+            self.cache.clear()
+            self.data_version = data_version
+
+        key = (path,) + tuple(sorted(params.items()))
+        now = time.monotonic()
+        cached = self.cache.get(key)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        # Identical requests arriving while the query runs wait for its result
+        pending = self.pending.get(key)
+        if pending:
+            return await asyncio.shield(pending)
+
+        run = {
+            "/vehicles": self.run_query,
+            "/search": self.run_search,
+            "/facets": self.run_facets,
+        }[path]
+        loop = asyncio.get_running_loop()
+        pending = self.pending[key] = loop.run_in_executor(self.executor, run, params)
+        try:
+            body = await asyncio.shield(pending)
+        finally:
+            del self.pending[key]
+
+        if len(self.cache) >= MAX_CACHE_ENTRIES:
+            self.cache.pop(next(iter(self.cache)))  # Evict the oldest entry
+        self.cache[key] = (now + self.cache_ttl, body)
+        return body
+
+
+async def read_request(reader):
+    """Read one HTTP request and return (method, target, headers), or None on EOF"""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+
+    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    return method, target, headers
+
+
+def build_response(status, body, keep_alive):
+    """Build an HTTP response with a JSON body"""
+    reasons = {
+        200: "OK",
+        400: "Bad Request",
+        404: "Not Found",
+        405: "Method Not Allowed",
+        500: "Internal Server Error",
+    }
+    head = (
+        f"HTTP/1.1 {status} {reasons[status]}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def handle_request(service, method, target):
+    """Route a request and return (status, body)"""
+    if method != "GET":
+        return 405, b'{"error": "Only GET is supported"}'
+
+    url = urlsplit(target)
+    if url.path == "/health":
+        return 200, b'{"status": "ok"}'
+    if url.path not in ("/vehicles", "/search", "/facets"):
+        return 404, b'{"error": "Not found"}'
+
+    params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+    try:
+        return 200, await service.fetch(url.path, params)
+    except QueryError as e:
+        return 400, json.dumps({"error": str(e)}).encode("utf-8")
+    except sqlite3.Error as e:
+        logging.error(f"Error querying vehicles: {e}")
+        return 500, b'{"error": "Database error"}'
+
+
+async def handle_connection(service, reader, writer):
+    """Serve requests on one keep-alive connection"""
+    try:
+        while True:
+            request = await read_request(reader)
+            if request is None:
+                break
+
+            method, target, headers = request
+            keep_alive = headers.get("connection", "").lower() != "close"
+            status, body = await handle_request(service, method, target)
+            writer.write(build_response(status, body, keep_alive))
+            await writer.drain()
+
+            if not keep_alive:
+                break
+
+    except (ConnectionError, ValueError) as e:
+        logging.debug(f"Connection closed: {e}")
+
+    except Exception as e:
+        logging.error(f"Error handling request: {e}")
+
+    finally:
+        writer.close()
+
+
+async def serve(db_file=DB_FILE, host=QUERY_API_HOST, port=QUERY_API_PORT):
+    """Start the query API and serve until cancelled"""
+    service = VehicleQueryService(db_file)
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_connection(service, reader, writer),
+        host,
+        port,
+        backlog=1024,
+    )
+    logging.info(f"Query API listening on http://{host}:{port}")
+
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        logging.info("Query API stopped.")
@@ -0,0 +1,33 @@
+import search_index
+
+
+# Queries must use this exact expression to hit the make index
+MAKE_SQL = search_index.make_sql()
+
+
+def setup_query_indexes(cursor):
+    """
+    Create the indexes backing the query API. Each leads with the equality
+    filters and ends with the sort key, so a page is read in order and the
+    scan stops at the page size.
+    """
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_vehicles_listing
+        ON vehicles (status, total_price, ref_no)"""
+    )
+    cursor.execute(
+        f"""
+        CREATE INDEX IF NOT EXISTS idx_vehicles_make
+        ON vehicles (status, {MAKE_SQL}, total_price, ref_no)"""
+    )
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_vehicles_location
+        ON vehicles (status, location, total_price, ref_no)"""
+    )
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_vehicles_grade
+        ON vehicles (status, auction_grade, total_price, ref_no)"""
+    )
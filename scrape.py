@@ -1,8 +1,5 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import WebDriverException
 import os
 import time
@@ -11,6 +8,13 @@ from dotenv import load_dotenv
 import logging
 import requests
 import sqlite3
+import hashlib
+import queue
+import threading
+import dedup
+import query_indexes
+import search_index
+from sites import DEFAULT_SITE, get_site_adapter
 from fake_useragent import UserAgent
 
 # TODO:
@@ -19,9 +23,7 @@ from fake_useragent import UserAgent
 
 # Load environment variables (Constants)
 load_dotenv()
-BASE_URL = os.getenv("BASE_URL")
-NUM_PAGES = int(os.getenv("NUM_PAGES"))
-DELAY = int(os.getenv("DELAY"))
+SITES = os.getenv("SITES", DEFAULT_SITE).split(",")  # Site adapters to crawl
 MAX_RETRIES = int(os.getenv("MAX_RETRIES"))
 LOG_DIRECTORY = os.getenv("LOG_DIRECTORY")
 BASE_YEAR = int(os.getenv("BASE_YEAR", 2009))  # Default to 2009 if BASE_YEAR is not set
@@ -59,7 +61,7 @@ def setup_logging(LOG_DIRECTORY):
 
     logging.basicConfig(
         level=logging.INFO,  # Log only INFO, WARNING, ERROR, and CRITICAL levels.
-        format="%(asctime)s - %(levelname)s - %(message)s",
+        format="%(asctime)s - %(threadName)s - %(levelname)s - %(message)s",
         handlers=[
             logging.FileHandler(log_filename),
             logging.StreamHandler(),
@@ -92,13 +94,50 @@ def init_webdriver():
     return webdriver.Chrome(options=chrome_options)
 
 
+# Columns added to the vehicles table after the original schema, in order
+ADDED_COLUMNS = [
+    ("content_hash", "TEXT"),
+    ("status", "TEXT DEFAULT 'available'"),
+    ("dedup_key", "TEXT"),
+    ("canonical_id", "TEXT"),
+    ("source", f"TEXT DEFAULT '{DEFAULT_SITE}'"),
+]
+
+# Fields that make up a vehicle's content hash (Ref No is the key, not content)
+HASHED_FIELDS = [
+    "Year",
+    "Title",
+    "Mileage",
+    "Engine Size",
+    "Engine Code",
+    "Model Code",
+    "Transmission",
+    "Drive",
+    "Steering",
+    "Doors",
+    "Seats",
+    "Fuel Type",
+    "Auction Grade",
+    "Total Price",
+    "Link",
+    "Colour",
+    "Location",
+    "Status",
+]
+
+
 # Database setup
 def setup_database():
     """Create SQLite table if it doesn't exist"""
     conn = sqlite3.connect("vehicles.db")
     cursor = conn.cursor()
+    # Columns added after the original schema share their definition with the
+    # migration below, so new and migrated databases end up identical
+    added_columns = "".join(
+        f",\n            {column} {definition}" for column, definition in ADDED_COLUMNS
+    )
     cursor.execute(
-        """
+        f"""
         CREATE TABLE IF NOT EXISTS vehicles (
             ref_no TEXT PRIMARY KEY,
             year INTEGER,
@@ -118,337 +157,452 @@ def setup_database():
             link TEXT,
             colour TEXT,
             location TEXT,
-            sent_to_discord INTEGER DEFAULT 0
+            sent_to_discord INTEGER DEFAULT 0{added_columns}
+        )
+    """
+    )
 
+    # Add columns introduced after the original schema to existing databases
+    existing_columns = {
+        row[1] for row in cursor.execute("PRAGMA table_info(vehicles)").fetchall()
+    }
+    new_columns = [
+        (column, definition)
+        for column, definition in ADDED_COLUMNS
+        if column not in existing_columns
+    ]
+    for column, definition in new_columns:
+        cursor.execute(f"ALTER TABLE vehicles ADD COLUMN {column} {definition}")
+
+    dedup.setup_dedup_index(cursor)
+    query_indexes.setup_query_indexes(cursor)
+    search_index.setup_search_index(cursor)
+
+    # Change feed consumed by notification and analytics scripts
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS vehicle_changes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ref_no TEXT,
+            change_type TEXT,
+            old_value TEXT,
+            new_value TEXT,
+            detected_at TEXT
         )
     """
     )
     conn.commit()
-    conn.close()
 
+    # Link the vehicles already in the database the first time dedup runs
+    if "canonical_id" in dict(new_columns):
+        dedup.rebuild_dedup_index(conn)
 
-# Function to extract vehicle data
-def extract_vehicle_data(vehicle_element):
-    """Extracts vehicle data"""
-    ref_no = "Unknown"
-    try:
-        title_element = WebDriverWait(vehicle_element, 2).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, ".make-model a"))
-        )
-        title = title_element.text.strip()
+    conn.close()
 
-        # strip year from title
-        title = title.split(" ")[1] + " " + title.split(" ")[2]
-        title = title if title else ""
 
-        # extract link
-        link = title_element.get_attribute("href")
-        link = link if link else ""
+def normalize_field(value):
+    """Normalize a field value so equal data always hashes the same"""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return " ".join(str(value).split()).upper()
 
-        ref_no_element = WebDriverWait(vehicle_element, 2).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "veh-stock-no"))
-        )
-        ref_no = ref_no_element.text.strip().replace("Ref No. ", "")[:8]
 
-        mileage_element = vehicle_element.find_element(
-            By.CSS_SELECTOR, ".mileage p.val"
-        )
-        mileage = mileage_element.text.strip()
-        mileage = mileage.replace("km", "")
-        mileage = mileage.replace(",", "")
-        mileage = mileage if mileage else ""
+def compute_content_hash(vehicle_data):
+    """Return a stable hash of the vehicle's normalized fields"""
+    normalized = "\x1f".join(
+        normalize_field(vehicle_data.get(field)) for field in HASHED_FIELDS
+    )
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
 
-        year_element = vehicle_element.find_element(By.CSS_SELECTOR, ".year p.val")
-        year = year_element.text.strip()[:4].replace(",", "")
-        year = year if year else ""
 
-        #####################
+# Maximum number of bound parameters per SQLite statement
+SQLITE_MAX_VARIABLES = 900
 
-        # Skip vehicles with a year greater than 2009
-        # if year.isdigit() and int(year) > 2009:
-        #     logging.info(f"Vehicle {ref_no} is from {year}, skipping...")
-        #     return None
 
-        if year.isdigit() and int(year) > YEAR_THRESHOLD:
-            logging.info(f"Vehicle {ref_no} is from {year}, skipping...")
-            return None
+# Function to fetch stored records for a batch of vehicles
+def fetch_existing_records(cursor, ref_nos):
+    """Fetch the stored hash, price, status and dedup fields for the given ref_nos in bulk."""
+    ref_nos = list(ref_nos)
+    existing = {}
 
-        #####################
+    for i in range(0, len(ref_nos), SQLITE_MAX_VARIABLES):
+        chunk = ref_nos[i : i + SQLITE_MAX_VARIABLES]
+        placeholders = ", ".join("?" * len(chunk))
+        cursor.execute(
+            f"""
+            SELECT ref_no, content_hash, total_price, status, mileage,
+                dedup_key, canonical_id
+            FROM vehicles WHERE ref_no IN ({placeholders})""",
+            chunk,
+        )
+        for (
+            ref_no,
+            content_hash,
+            total_price,
+            status,
+            mileage,
+            dedup_key,
+            canonical_id,
+        ) in cursor.fetchall():
+            existing[ref_no] = {
+                "Content Hash": content_hash,
+                "Total Price": total_price,
+                "Status": status or "available",
+                "Mileage": mileage,
+                "Dedup Key": dedup_key,
+                "Canonical Id": canonical_id,
+            }
+
+    return existing
 
-        engine_element = vehicle_element.find_element(By.CSS_SELECTOR, ".engine p.val")
-        engine_size = engine_element.text.strip().replace("cc", "").replace(",", "")
 
-        # convert engine size to float
-        engine_size = float(engine_size) if engine_size.isdigit() else ""
+# Function to insert data into database
+def insert_vehicle_data(cursor, vehicle_data):
+    """Insert a new vehicle record into the database."""
+    cursor.execute(
+        """
+        INSERT INTO vehicles (
+            ref_no, year, title, mileage, engine_size, engine_code,
+            model_code, transmission, drive, steering, doors, seats,
+            fuel_type, auction_grade, total_price, link, colour, location,
+            content_hash, status, dedup_key, canonical_id, source
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        (
+            vehicle_data["Ref No"],
+            vehicle_data["Year"],
+            vehicle_data["Title"],
+            vehicle_data["Mileage"],
+            vehicle_data["Engine Size"],
+            vehicle_data["Engine Code"],
+            vehicle_data["Model Code"],
+            vehicle_data["Transmission"],
+            vehicle_data["Drive"],
+            vehicle_data["Steering"],
+            vehicle_data["Doors"],
+            vehicle_data["Seats"],
+            vehicle_data["Fuel Type"],
+            vehicle_data["Auction Grade"],
+            vehicle_data["Total Price"],
+            vehicle_data["Link"],
+            vehicle_data["Colour"],
+            vehicle_data["Location"],
+            vehicle_data["Content Hash"],
+            vehicle_data["Status"],
+            vehicle_data["Dedup Key"],
+            vehicle_data["Canonical Id"],
+            vehicle_data["Source"],
+        ),
+    )
 
-        # convert engine size to litres
-        engine_size = engine_size / 1000
 
-        transmission_element = vehicle_element.find_element(
-            By.CSS_SELECTOR, ".trans p.val"
-        )
+# Function to update changed data in database
+def update_vehicle_data(cursor, vehicle_data):
+    """Overwrite an existing vehicle record with freshly scraped data."""
+    # Sold / under offer listings carry no price, keep the last known one
+    cursor.execute(
+        """
+        UPDATE vehicles SET
+            year = ?, title = ?, mileage = ?, engine_size = ?, engine_code = ?,
+            model_code = ?, transmission = ?, drive = ?, steering = ?, doors = ?,
+            seats = ?, fuel_type = ?, auction_grade = ?,
+            total_price = COALESCE(?, total_price), link = ?, colour = ?,
+            location = ?, content_hash = ?, status = ?, dedup_key = ?,
+            canonical_id = ?
+        WHERE ref_no = ?""",
+        (
+            vehicle_data["Year"],
+            vehicle_data["Title"],
+            vehicle_data["Mileage"],
+            vehicle_data["Engine Size"],
+            vehicle_data["Engine Code"],
+            vehicle_data["Model Code"],
+            vehicle_data["Transmission"],
+            vehicle_data["Drive"],
+            vehicle_data["Steering"],
+            vehicle_data["Doors"],
+            vehicle_data["Seats"],
+            vehicle_data["Fuel Type"],
+            vehicle_data["Auction Grade"],
+            vehicle_data["Total Price"],
+            vehicle_data["Link"],
+            vehicle_data["Colour"],
+            vehicle_data["Location"],
+            vehicle_data["Content Hash"],
+            vehicle_data["Status"],
+            vehicle_data["Dedup Key"],
+            vehicle_data["Canonical Id"],
+            vehicle_data["Ref No"],
+        ),
+    )
 
-        transmission = transmission_element.text.strip()
-        transmission = transmission if transmission else ""
 
-        location_element = vehicle_element.find_element(
-            By.CSS_SELECTOR, "p.val.stock-area"
-        )
+# Function to check whether a vehicle needs re-linking to its duplicates
+def dedup_fields_changed(record, vehicle_data):
+    """Check if the fields used to find duplicates differ from the stored record."""
+    dedup_key = dedup.compute_dedup_key(vehicle_data)
+    mileage = dedup.parse_mileage(vehicle_data["Mileage"])
+    return dedup_key != record["Dedup Key"] or mileage != dedup.parse_mileage(
+        record["Mileage"]
+    )
 
-        location = location_element.text.strip()
-        location = location if location else ""
 
-        specs_table = vehicle_element.find_element(By.CLASS_NAME, "table-detailed-spec")
-        table_rows = specs_table.find_elements(By.TAG_NAME, "tr")
+# Function to write a batch of vehicles and record what changed
+def write_vehicle_batch(cursor, vehicles):
+    """
+    Write a batch of scraped vehicles, touching only rows that are new or whose
+    content hash changed. Returns the change feed entries recorded in the
+    vehicle_changes table as (ref_no, change_type, old_value, new_value) tuples.
+    """
+    batch = {vehicle_data["Ref No"]: vehicle_data for vehicle_data in vehicles}
+    existing = fetch_existing_records(cursor, batch.keys())
+    changes = []
+    unchanged = 0
 
-        engine_code = (
-            table_rows[1].find_elements(By.TAG_NAME, "td")[1].text.strip()
-            if len(table_rows) >= 2
-            else ""
-        )
+    for ref_no, vehicle_data in batch.items():
+        record = existing.get(ref_no)
 
-        if engine_code == "0":
-            engine_code = ""
+        try:
+            if record is None:
+                if vehicle_data["Status"] != "available":
+                    logging.info(
+                        f"Vehicle {ref_no} is {vehicle_data['Status']}, skipping..."
+                    )
+                    continue
+
+                dedup.link_vehicle(cursor, vehicle_data)
+                insert_vehicle_data(cursor, vehicle_data)
+                changes.append((ref_no, "new", None, vehicle_data["Total Price"]))
+                logging.info(f"Vehicle {ref_no} added successfully.")
+                continue
+
+            if record["Content Hash"] == vehicle_data["Content Hash"]:
+                unchanged += 1
+                continue
+
+            # Re-link the vehicle only if the fields it was matched on changed
+            if dedup_fields_changed(record, vehicle_data):
+                dedup.link_vehicle(cursor, vehicle_data)
+            else:
+                vehicle_data["Dedup Key"] = record["Dedup Key"]
+                vehicle_data["Canonical Id"] = record["Canonical Id"]
+
+            update_vehicle_data(cursor, vehicle_data)
+
+            if (
+                vehicle_data["Total Price"] is not None
+                and vehicle_data["Total Price"] != record["Total Price"]
+            ):
+                changes.append(
+                    (
+                        ref_no,
+                        "price_changed",
+                        record["Total Price"],
+                        vehicle_data["Total Price"],
+                    )
+                )
+                logging.info(
+                    f"Vehicle {ref_no} price changed from {record['Total Price']} to {vehicle_data['Total Price']}."
+                )
+
+            if vehicle_data["Status"] != record["Status"]:
+                changes.append(
+                    (ref_no, "status_changed", record["Status"], vehicle_data["Status"])
+                )
+                logging.info(
+                    f"Vehicle {ref_no} status changed from {record['Status']} to {vehicle_data['Status']}."
+                )
 
-        colour = (
-            table_rows[2].find_elements(By.TAG_NAME, "td")[3].text.strip()
-            if len(table_rows) >= 4
-            else ""
+        except Exception as e:
+            logging.error(f"Error writing data for {ref_no}: {e}")
+
+    if changes:
+        detected_at = datetime.datetime.now().isoformat(timespec="seconds")
+        cursor.executemany(
+            """
+            INSERT INTO vehicle_changes (
+                ref_no, change_type, old_value, new_value, detected_at
+            ) VALUES (?, ?, ?, ?, ?)""",
+            [
+                (
+                    ref_no,
+                    change_type,
+                    None if old_value is None else str(old_value),
+                    None if new_value is None else str(new_value),
+                    detected_at,
+                )
+                for ref_no, change_type, old_value, new_value in changes
+            ],
         )
 
-        model_code = (
-            table_rows[2].find_elements(By.TAG_NAME, "td")[1].text.strip()
-            if len(table_rows) >= 3
-            else ""
-        )
+    if unchanged:
+        logging.info(f"{unchanged} existing vehicles unchanged, skipping.")
 
-        steering = (
-            table_rows[1].find_elements(By.TAG_NAME, "td")[3].text.strip()
-            if len(table_rows) >= 4
-            else ""
-        )
+    return changes
 
-        seat_element = vehicle_element.find_element(
-            By.CSS_SELECTOR, "td.td-4th"
-        ).text.strip()
 
-        seats = seat_element if seat_element else ""
+# Function to load the configured site adapters
+def load_sites():
+    """Create an adapter for each site listed in SITES"""
+    return [
+        get_site_adapter(name.strip()).from_env(max_year=YEAR_THRESHOLD)
+        for name in SITES
+        if name.strip()
+    ]
 
-        if seats == "ASK":
-            seats = ""
 
-        drive = (
-            table_rows[2].find_elements(By.TAG_NAME, "td")[5].text.strip()
-            if len(table_rows) >= 3
-            else ""
-        )
+# Rate limiting shared by the workers crawling one site
+class RateLimiter:
+    """Enforce a minimum delay between page requests across threads"""
 
-        doors = (
-            table_rows[2].find_elements(By.TAG_NAME, "td")[7].text.strip()
-            if len(table_rows) >= 3
-            else ""
-        )
+    def __init__(self, delay):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.next_request = time.monotonic()
 
-        if doors == "ASK":
-            doors = ""
+    def wait(self):
+        """Block until the next request to the site is allowed"""
+        with self.lock:
+            now = time.monotonic()
+            wait_time = self.next_request - now
+            self.next_request = max(now, self.next_request) + self.delay
 
-        auc_table = vehicle_element.find_element(
-            By.CSS_SELECTOR, ".table-detailed-spec"
-        )
+        if wait_time > 0:
+            time.sleep(wait_time)
 
-        auc_rows = auc_table.find_elements(By.TAG_NAME, "tr")
 
-        auction_grade = (
-            auc_rows[-1].find_elements(By.TAG_NAME, "td")[1].text.strip()
-            if len(auc_rows) >= 4
-            else ""
-        )
+# Function to scrape pages
+def crawl_site(site, page_numbers, rate_limiter, write_queue, stop_event):
+    """Take pages from the site's page queue and scrape them with a dedicated browser"""
+    driver = init_webdriver()
 
-        fuel_element = vehicle_element.find_element(
-            By.CSS_SELECTOR, "td.td-3rd"
-        ).text.strip()
+    try:
+        while not stop_event.is_set():
+            try:
+                page_number = page_numbers.get_nowait()
+            except queue.Empty:
+                return
 
-        fuel = fuel_element if fuel_element else ""
+            retries = 0  # Initialize retries for each page
 
-        # Map fuel types to standardised values
-        fuel_mapping = {
-            "Hybrid(Petrol)": "Petrol",
-            "Hybrid(Diesel)": "Diesel",
-            "Electric": "Electric",
-            "Other": "",
-            "LPG": "Petrol",
-            "CNG": "CNG",
-        }
+            while retries < MAX_RETRIES and not stop_event.is_set():
+                rate_limiter.wait()
 
-        fuel = fuel_mapping.get(fuel, fuel)
+                try:
+                    driver.get(site.page_url(page_number))
+                    vehicle_elements = site.find_vehicle_elements(driver)
 
-        price_element = WebDriverWait(vehicle_element, 1).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "p.total-price"))
-        )
+                    page_vehicles = []
+                    for vehicle_element in vehicle_elements:
+                        vehicle_data = site.extract_vehicle_data(vehicle_element)
 
-        price_element = vehicle_element.find_element(By.CSS_SELECTOR, "p.total-price")
-        price = price_element.text.strip()
+                        if vehicle_data:
+                            vehicle_data["Content Hash"] = compute_content_hash(
+                                vehicle_data
+                            )
+                            page_vehicles.append(vehicle_data)
 
-        if "SOLD" in price.upper() or "UNDER OFFER" in price.upper():
-            logging.info(
-                f"Vehicle {ref_no} has been sold or is under offer, skipping..."
-            )
-            return None
-
-        price = price.replace("$", "").replace(",", "")
-
-        if price == "ASK":
-            logging.info(f"Vehicle {ref_no} has no price, skipping...")
-            return None
-
-        price = round(float(price), 2)
-
-        return {
-            "Ref No": ref_no,
-            "Year": year,
-            "Title": title,
-            "Mileage": mileage,
-            "Engine Size": engine_size,
-            "Engine Code": engine_code,
-            "Model Code": model_code,
-            "Transmission": transmission,
-            "Drive": drive,
-            "Steering": steering,
-            "Doors": doors,
-            "Seats": seats,
-            "Fuel Type": fuel,
-            "Auction Grade": auction_grade,
-            "Total Price": price,
-            "Link": link,
-            "Colour": colour,
-            "Location": location,
-        }
-    except Exception:
-        return None
-
-
-# Function to check if vehicle exists in database
-def vehicle_exists(cursor, ref_no):
-    """Check if a record with the given ref_no already exists in the database."""
-    cursor.execute("SELECT 1 FROM vehicles WHERE ref_no = ?", (ref_no,))
-    return cursor.fetchone() is not None
+                    write_queue.put((site.name, page_number, page_vehicles))
 
+                    break  # Break out of the retries loop, go to next page
 
-# Function to insert data into database
-def insert_vehicle_data(cursor, vehicle_data):
-    """Insert vehicle data into the database if it doesn't already exist."""
-    if not vehicle_exists(cursor, vehicle_data["Ref No"]):
-        try:
-            cursor.execute(
-                """
-                INSERT INTO vehicles (
-                    ref_no, year, title, mileage, engine_size, engine_code, 
-                    model_code, transmission, drive, steering, doors, seats, 
-                    fuel_type, auction_grade, total_price, link, colour, location
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    vehicle_data["Ref No"],
-                    vehicle_data["Year"],
-                    vehicle_data["Title"],
-                    vehicle_data["Mileage"],
-                    vehicle_data["Engine Size"],
-                    vehicle_data["Engine Code"],
-                    vehicle_data["Model Code"],
-                    vehicle_data["Transmission"],
-                    vehicle_data["Drive"],
-                    vehicle_data["Steering"],
-                    vehicle_data["Doors"],
-                    vehicle_data["Seats"],
-                    vehicle_data["Fuel Type"],
-                    vehicle_data["Auction Grade"],
-                    vehicle_data["Total Price"],
-                    vehicle_data["Link"],
-                    vehicle_data["Colour"],
-                    vehicle_data["Location"],
-                ),
-            )
-        except Exception as e:
-            logging.error(f"Error inserting data for {vehicle_data['Ref No']}: {e}")
-    else:
-        logging.info(
-            f"Record with Ref No {vehicle_data['Ref No']} already exists. Skipping insertion."
-        )
+                except (WebDriverException, requests.exceptions.RequestException) as e:
+                    logging.error(f"Error on {site.name} page {page_number}: {e}")
+                    logging.info("Refreshing page...")
+                    driver.refresh()
+                    retries += 1
 
-    if vehicle_exists(cursor, vehicle_data["Ref No"]):
-        logging.info(f"Vehicle {vehicle_data['Ref No']} added successfully.")
+                except Exception as e:
+                    logging.error(f"Error on {site.name} page {page_number}: {e}")
+                    break  # Break out of the retries loop due to unexpected error
 
+    finally:
+        driver.quit()
 
-# Function to scrape pages
-def scrape_pages(driver):
-    """Loop through pages and scrape data"""
-    successful_pages = 0
+
+# Function to write scraped pages to database
+def write_pages(write_queue):
+    """Write pages scraped by every site's workers from a single connection"""
+    successful_pages = {}
     pages_since_last_commit = 0  # Counter for pages processed since the last commit
 
     with sqlite3.connect("vehicles.db") as conn:
         cursor = conn.cursor()
 
-        for page_number in range(1, NUM_PAGES + 1):
-            retries = 0  # Initialize retries for each page
-            time.sleep(DELAY)
+        while True:
+            item = write_queue.get()
+            if item is None:
+                break
 
-            while retries < MAX_RETRIES:
-                try:
-                    driver.get(BASE_URL.format(page_number))
-                    wait = WebDriverWait(driver, 120, poll_frequency=5)
+            source, page_number, page_vehicles = item
+            write_vehicle_batch(cursor, page_vehicles)
 
-                    vehicle_elements = wait.until(
-                        EC.presence_of_all_elements_located(
-                            (By.CSS_SELECTOR, ".stocklist-row")
-                        )
-                    )
+            successful_pages[source] = successful_pages.get(source, 0) + 1
+            pages_since_last_commit += 1
 
-                    for vehicle_element in vehicle_elements:
-                        vehicle_data = extract_vehicle_data(vehicle_element)
+            if pages_since_last_commit >= 20:
+                conn.commit()
+                pages_since_last_commit = 0
 
-                        if vehicle_data:
-                            insert_vehicle_data(cursor, vehicle_data)
+            logging.info(f"{source} page {page_number} processed successfully.")
 
-                    successful_pages += 1
-                    pages_since_last_commit += 1
+        for source, count in successful_pages.items():
+            logging.info(f"Total {source} pages successfully scraped: {count}")
 
-                    if pages_since_last_commit >= 20:
-                        conn.commit()
-                        pages_since_last_commit = 0
+        conn.commit()
 
-                    logging.info(f"Page {page_number} processed successfully.")
 
-                    break  # Break out of the retries loop, go to next page
+# Function to scrape all sites
+def scrape_sites(sites):
+    """Crawl all sites concurrently, each within its own delay and concurrency"""
+    write_queue = queue.Queue()
+    stop_event = threading.Event()
 
-                except (WebDriverException, requests.exceptions.RequestException) as e:
-                    logging.error(f"Error on page {page_number}: {e}")
-                    logging.info("Refreshing page...")
-                    driver.refresh()
-                    retries += 1
+    writer = threading.Thread(target=write_pages, args=(write_queue,), name="writer")
+    writer.start()
 
-                except KeyboardInterrupt:
-                    logging.info("Keyboard interrupt detected, exiting...")
-                    return
+    workers = []
+    for site in sites:
+        page_numbers = queue.Queue()
+        for page_number in site.page_numbers():
+            page_numbers.put(page_number)
 
-                except Exception as e:
-                    logging.error(f"Error on page {page_number}: {e}")
-                    break  # Break out of the retries loop due to unexpected error
+        rate_limiter = RateLimiter(site.delay)
 
-        logging.info(f"Total pages successfully scraped: {successful_pages}")
+        for i in range(site.concurrency):
+            worker = threading.Thread(
+                target=crawl_site,
+                args=(site, page_numbers, rate_limiter, write_queue, stop_event),
+                name=f"{site.name}-{i + 1}",
+            )
+            worker.start()
+            workers.append(worker)
 
-        conn.commit()
+    try:
+        for worker in workers:
+            worker.join()
+
+    except KeyboardInterrupt:
+        logging.info("Keyboard interrupt detected, exiting...")
+        stop_event.set()
+        for worker in workers:
+            worker.join()
+
+    finally:
+        write_queue.put(None)
+        writer.join()
 
 
 if __name__ == "__main__":
     setup_logging(LOG_DIRECTORY)
     start_time = start_timer()
-    driver = init_webdriver()
     setup_database()
 
     try:
-        scrape_pages(driver)
+        scrape_sites(load_sites())
 
     finally:
-        driver.quit()
         logging.info("Script finished, scraping complete!")
 
         elapsed_time_s = time.time() - start_time
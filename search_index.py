@@ -0,0 +1,208 @@
+import sqlite3
+import logging
+import re
+import os
+from dotenv import load_dotenv
+
+
+# Vehicle columns indexed for full-text search
+SEARCH_COLUMNS = ["title", "model_code", "engine_code", "colour"]
+
+
+def make_sql(title="title"):
+    """SQL expression for a vehicle's make, the first word of its title"""
+    return f"substr({title}, 1, instr({title} || ' ', ' ') - 1)"
+
+
+# Facets counted over available vehicles, mapped to the SQL for their value
+FACETS = {
+    "make": make_sql("{row}.title"),
+    "location": "{row}.location",
+    "grade": "{row}.auction_grade",
+    "fuel_type": "{row}.fuel_type",
+    "year": "{row}.year",
+}
+
+
+def facet_values_sql(row):
+    """SQL VALUES rows of (facet, value) for the vehicle referenced by row"""
+    return ", ".join(
+        f"('{facet}', COALESCE({expression.format(row=row)}, ''))"
+        for facet, expression in FACETS.items()
+    )
+
+
+def search_index_in_sync(cursor):
+    """
+    Check that every full-text row still sits at its vehicle's rowid. A VACUUM
+    can renumber the rowids of the vehicles table, which breaks the triggers.
+    """
+    cursor.execute(
+        """
+        SELECT (SELECT COUNT(*) FROM vehicles_fts) = (SELECT COUNT(*) FROM vehicles)
+        AND NOT EXISTS (
+            SELECT 1 FROM vehicles_fts f LEFT JOIN vehicles v ON v.rowid = f.rowid
+            WHERE v.ref_no IS NOT f.ref_no
+        )"""
+    )
+    return bool(cursor.fetchone()[0])
+
+
+def setup_search_index(cursor):
+    """
+    Create the full-text index and facet counts, and the triggers that keep
+    them in sync with every insert, update and delete on the vehicles table.
+    The full-text rowid is the vehicle's rowid; ref_no is stored alongside so
+    searches join on it, and the index is rebuilt if the rowids have drifted.
+    """
+    cursor.execute("SELECT * FROM sqlite_master WHERE name = 'vehicles_fts'")
+    exists = cursor.fetchone() is not None
+
+    cursor.execute(
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS vehicles_fts
+        USING fts5(ref_no UNINDEXED, {", ".join(SEARCH_COLUMNS)}, prefix = '2 3 4')"""
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS vehicle_facets (
+            facet TEXT,
+            value TEXT,
+            count INTEGER,
+            PRIMARY KEY (facet, value)
+        )
+    """
+    )
+
+    columns = ", ".join(SEARCH_COLUMNS)
+    new_columns = ", ".join(f"new.{column}" for column in SEARCH_COLUMNS)
+
+    add_facets = f"""
+            INSERT INTO vehicle_facets (facet, value, count)
+            SELECT column1, column2, 1 FROM (VALUES {facet_values_sql("new")})
+            WHERE new.status = 'available'
+            ON CONFLICT (facet, value) DO UPDATE SET count = count + 1;"""
+    remove_facets = f"""
+            UPDATE vehicle_facets SET count = count - 1
+            WHERE old.status = 'available'
+            AND (facet, value) IN (VALUES {facet_values_sql("old")});"""
+
+    cursor.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS vehicles_search_insert
+        AFTER INSERT ON vehicles BEGIN
+            INSERT INTO vehicles_fts (rowid, ref_no, {columns})
+            VALUES (new.rowid, new.ref_no, {new_columns});
+            {add_facets}
+        END"""
+    )
+    cursor.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS vehicles_search_delete
+        AFTER DELETE ON vehicles BEGIN
+            DELETE FROM vehicles_fts WHERE rowid = old.rowid;
+            {remove_facets}
+        END"""
+    )
+    cursor.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS vehicles_search_update
+        AFTER UPDATE OF ref_no, {columns} ON vehicles BEGIN
+            DELETE FROM vehicles_fts WHERE rowid = old.rowid;
+            INSERT INTO vehicles_fts (rowid, ref_no, {columns})
+            VALUES (new.rowid, new.ref_no, {new_columns});
+        END"""
+    )
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS vehicles_facets_update
+        AFTER UPDATE OF title, location, auction_grade, fuel_type, year, status
+        ON vehicles BEGIN"""
+        + remove_facets
+        + add_facets
+        + """
+        END"""
+    )
+
+    if not exists or not search_index_in_sync(cursor):
+        logging.info("Rebuilding search index and facet counts.")
+        rebuild_search_index(cursor)
+
+
+def rebuild_search_index(cursor):
+    """
+    Repopulate the full-text index and facet counts from the vehicles table.
+    """
+    columns = ", ".join(SEARCH_COLUMNS)
+    cursor.execute("DELETE FROM vehicles_fts")
+    cursor.execute(
+        f"""
+        INSERT INTO vehicles_fts (rowid, ref_no, {columns})
+        SELECT rowid, ref_no, {columns} FROM vehicles"""
+    )
+
+    cursor.execute("DELETE FROM vehicle_facets")
+    for facet, expression in FACETS.items():
+        value = expression.format(row="vehicles")
+        cursor.execute(
+            f"""
+            INSERT INTO vehicle_facets (facet, value, count)
+            SELECT '{facet}', COALESCE({value}, ''), COUNT(*) FROM vehicles
+            WHERE status = 'available' GROUP BY 1, 2""",
+        )
+
+
+def build_match_query(text):
+    """
+    Turn free text into an FTS5 query matching every word as a prefix, so
+    user input never hits FTS5 query syntax. Returns None for empty text.
+    """
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def search_vehicles(cursor, text, columns, limit):
+    """
+    Return the given columns of available vehicles matching text, newest
+    first. Ordering by rowid lets FTS5 stop at the limit instead of ranking
+    every match, which matters for broad terms such as a make or colour.
+    """
+    match_query = build_match_query(text)
+    if match_query is None:
+        return []
+
+    cursor.execute(
+        f"""
+        SELECT {", ".join(f"v.{column}" for column in columns)}
+        FROM vehicles_fts f JOIN vehicles v ON v.ref_no = f.ref_no
+        WHERE vehicles_fts MATCH ? AND v.status = 'available'
+        ORDER BY f.rowid DESC LIMIT ?""",
+        (match_query, limit),
+    )
+    return cursor.fetchall()
+
+
+def facet_counts(cursor, facet):
+    """Return (value, count) pairs for a facet, most common first"""
+    cursor.execute(
+        """
+        SELECT value, count FROM vehicle_facets
+        WHERE facet = ? AND count > 0 ORDER BY count DESC, value""",
+        (facet,),
+    )
+    return cursor.fetchall()
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
+    with sqlite3.connect(os.getenv("DB_FILE", "vehicles.db")) as conn:
+        cursor = conn.cursor()
+        setup_search_index(cursor)
+        rebuild_search_index(cursor)
+        logging.info("Search index and facet counts rebuilt.")
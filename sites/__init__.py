@@ -0,0 +1,20 @@
+from sites.base import SiteAdapter
+from sites.stocklist import StocklistSite
+
+
+# Adapters available to the scraper, keyed by the name used in SITES
+SITE_ADAPTERS = {
+    StocklistSite.name: StocklistSite,
+}
+
+DEFAULT_SITE = StocklistSite.name
+
+
+def get_site_adapter(name):
+    """Return the adapter class registered under name"""
+    try:
+        return SITE_ADAPTERS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown site {name!r}, expected one of {list(SITE_ADAPTERS)}"
+        )
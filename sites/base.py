@@ -0,0 +1,89 @@
+import os
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+
+class SiteAdapter:
+    """
+    Base class for auction site adapters. An adapter knows how to page through
+    a site's stock list, find the vehicle rows on a page, extract each row into
+    the shared vehicle schema and detect whether a listing is still available.
+
+    Subclasses set the class attributes below and implement
+    extract_vehicle_data().
+    """
+
+    # Value stored in the source column for this site's vehicles
+    name = None
+
+    # Prefix for this site's environment variables, e.g. "OTHER_" reads
+    # OTHER_BASE_URL, OTHER_NUM_PAGES, OTHER_DELAY and OTHER_CONCURRENCY
+    env_prefix = ""
+
+    # Prepended to ref numbers so they stay unique across sites
+    ref_prefix = ""
+
+    # CSS selector matching one vehicle row on a stock list page
+    row_selector = None
+
+    # CSS selector of the element holding the price / sold label
+    price_selector = None
+
+    def __init__(self, base_url, num_pages, delay=0, concurrency=1, max_year=None):
+        self.base_url = base_url
+        self.num_pages = num_pages
+        self.delay = delay  # Minimum seconds between page requests to this site
+        self.concurrency = concurrency  # Number of browsers crawling this site
+        self.max_year = max_year  # Skip vehicles newer than this year
+
+    @classmethod
+    def from_env(cls, max_year=None):
+        """Create the adapter from its environment variables"""
+        return cls(
+            base_url=os.getenv(f"{cls.env_prefix}BASE_URL"),
+            num_pages=int(os.getenv(f"{cls.env_prefix}NUM_PAGES")),
+            delay=int(os.getenv(f"{cls.env_prefix}DELAY", 0)),
+            concurrency=int(os.getenv(f"{cls.env_prefix}CONCURRENCY", 1)),
+            max_year=max_year,
+        )
+
+    def page_numbers(self):
+        """Return the page numbers to crawl"""
+        return range(1, self.num_pages + 1)
+
+    def page_url(self, page_number):
+        """Return the URL of a stock list page"""
+        return self.base_url.format(page_number)
+
+    def find_vehicle_elements(self, driver):
+        """Wait for and return the vehicle rows on the current page"""
+        wait = WebDriverWait(driver, 120, poll_frequency=5)
+        return wait.until(
+            EC.presence_of_all_elements_located((By.CSS_SELECTOR, self.row_selector))
+        )
+
+    def status_from_price(self, price):
+        """Map the text of the price element to a listing status"""
+        price = price.upper()
+        if "SOLD" in price:
+            return "sold"
+        if "UNDER OFFER" in price:
+            return "under offer"
+        if price == "ASK":
+            return "no price"
+        return "available"
+
+    def detect_status(self, element):
+        """Return the listing status shown in element (a row or a whole page)"""
+        price_element = WebDriverWait(element, 5).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, self.price_selector))
+        )
+        return self.status_from_price(price_element.text.strip())
+
+    def extract_vehicle_data(self, vehicle_element):
+        """
+        Return a dict with the vehicle fields ("Ref No", "Year", "Title", ...,
+        "Status") for one row, or None to skip the row.
+        """
+        raise NotImplementedError
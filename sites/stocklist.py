@@ -0,0 +1,214 @@
+import logging
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from sites.base import SiteAdapter
+
+
+class StocklistSite(SiteAdapter):
+    """The original auction site, configured by BASE_URL, NUM_PAGES and DELAY"""
+
+    name = "stocklist"
+    env_prefix = ""
+    ref_prefix = ""
+    row_selector = ".stocklist-row"
+    price_selector = "p.total-price"
+
+    def extract_vehicle_data(self, vehicle_element):
+        """Extracts vehicle data"""
+        ref_no = "Unknown"
+        try:
+            title_element = WebDriverWait(vehicle_element, 2).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, ".make-model a"))
+            )
+            title = title_element.text.strip()
+
+            # strip year from title
+            title = title.split(" ")[1] + " " + title.split(" ")[2]
+            title = title if title else ""
+
+            # extract link
+            link = title_element.get_attribute("href")
+            link = link if link else ""
+
+            ref_no_element = WebDriverWait(vehicle_element, 2).until(
+                EC.presence_of_element_located((By.CLASS_NAME, "veh-stock-no"))
+            )
+            ref_no = (
+                self.ref_prefix
+                + ref_no_element.text.strip().replace("Ref No. ", "")[:8]
+            )
+
+            mileage_element = vehicle_element.find_element(
+                By.CSS_SELECTOR, ".mileage p.val"
+            )
+            mileage = mileage_element.text.strip()
+            mileage = mileage.replace("km", "")
+            mileage = mileage.replace(",", "")
+            mileage = mileage if mileage else ""
+
+            year_element = vehicle_element.find_element(By.CSS_SELECTOR, ".year p.val")
+            year = year_element.text.strip()[:4].replace(",", "")
+            year = year if year else ""
+
+            #####################
+
+            # Skip vehicles with a year greater than 2009
+            # if year.isdigit() and int(year) > 2009:
+            #     logging.info(f"Vehicle {ref_no} is from {year}, skipping...")
+            #     return None
+
+            if self.max_year and year.isdigit() and int(year) > self.max_year:
+                logging.info(f"Vehicle {ref_no} is from {year}, skipping...")
+                return None
+
+            #####################
+
+            engine_element = vehicle_element.find_element(
+                By.CSS_SELECTOR, ".engine p.val"
+            )
+            engine_size = engine_element.text.strip().replace("cc", "").replace(",", "")
+
+            # convert engine size to float
+            engine_size = float(engine_size) if engine_size.isdigit() else ""
+
+            # convert engine size to litres
+            engine_size = engine_size / 1000
+
+            transmission_element = vehicle_element.find_element(
+                By.CSS_SELECTOR, ".trans p.val"
+            )
+
+            transmission = transmission_element.text.strip()
+            transmission = transmission if transmission else ""
+
+            location_element = vehicle_element.find_element(
+                By.CSS_SELECTOR, "p.val.stock-area"
+            )
+
+            location = location_element.text.strip()
+            location = location if location else ""
+
+            specs_table = vehicle_element.find_element(
+                By.CLASS_NAME, "table-detailed-spec"
+            )
+            table_rows = specs_table.find_elements(By.TAG_NAME, "tr")
+
+            engine_code = (
+                table_rows[1].find_elements(By.TAG_NAME, "td")[1].text.strip()
+                if len(table_rows) >= 2
+                else ""
+            )
+
+            if engine_code == "0":
+                engine_code = ""
+
+            colour = (
+                table_rows[2].find_elements(By.TAG_NAME, "td")[3].text.strip()
+                if len(table_rows) >= 4
+                else ""
+            )
+
+            model_code = (
+                table_rows[2].find_elements(By.TAG_NAME, "td")[1].text.strip()
+                if len(table_rows) >= 3
+                else ""
+            )
+
+            steering = (
+                table_rows[1].find_elements(By.TAG_NAME, "td")[3].text.strip()
+                if len(table_rows) >= 4
+                else ""
+            )
+
+            seat_element = vehicle_element.find_element(
+                By.CSS_SELECTOR, "td.td-4th"
+            ).text.strip()
+
+            seats = seat_element if seat_element else ""
+
+            if seats == "ASK":
+                seats = ""
+
+            drive = (
+                table_rows[2].find_elements(By.TAG_NAME, "td")[5].text.strip()
+                if len(table_rows) >= 3
+                else ""
+            )
+
+            doors = (
+                table_rows[2].find_elements(By.TAG_NAME, "td")[7].text.strip()
+                if len(table_rows) >= 3
+                else ""
+            )
+
+            if doors == "ASK":
+                doors = ""
+
+            auc_table = vehicle_element.find_element(
+                By.CSS_SELECTOR, ".table-detailed-spec"
+            )
+
+            auc_rows = auc_table.find_elements(By.TAG_NAME, "tr")
+
+            auction_grade = (
+                auc_rows[-1].find_elements(By.TAG_NAME, "td")[1].text.strip()
+                if len(auc_rows) >= 4
+                else ""
+            )
+
+            fuel_element = vehicle_element.find_element(
+                By.CSS_SELECTOR, "td.td-3rd"
+            ).text.strip()
+
+            fuel = fuel_element if fuel_element else ""
+
+            # Map fuel types to standardised values
+            fuel_mapping = {
+                "Hybrid(Petrol)": "Petrol",
+                "Hybrid(Diesel)": "Diesel",
+                "Electric": "Electric",
+                "Other": "",
+                "LPG": "Petrol",
+                "CNG": "CNG",
+            }
+
+            fuel = fuel_mapping.get(fuel, fuel)
+
+            price_element = WebDriverWait(vehicle_element, 1).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, self.price_selector))
+            )
+            price = price_element.text.strip()
+
+            # Sold / under offer / unpriced listings are kept so existing records
+            # can pick up the status change; the writer does not insert them
+            status = self.status_from_price(price)
+            if status != "available":
+                price = None
+            else:
+                price = round(float(price.replace("$", "").replace(",", "")), 2)
+
+            return {
+                "Source": self.name,
+                "Ref No": ref_no,
+                "Year": year,
+                "Title": title,
+                "Mileage": mileage,
+                "Engine Size": engine_size,
+                "Engine Code": engine_code,
+                "Model Code": model_code,
+                "Transmission": transmission,
+                "Drive": drive,
+                "Steering": steering,
+                "Doors": doors,
+                "Seats": seats,
+                "Fuel Type": fuel,
+                "Auction Grade": auction_grade,
+                "Total Price": price,
+                "Link": link,
+                "Colour": colour,
+                "Location": location,
+                "Status": status,
+            }
+        except Exception:
+            return None
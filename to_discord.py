@@ -14,7 +14,8 @@ DB_FILE = os.getenv("DB_FILE")
 
 
 def meets_requirements(vehicle):
-    titles = [
+    # Titles start with the make, so match it with a set lookup
+    titles = {
         "TOYOTA",
         "LEXUS",
         "HONDA",
@@ -25,7 +26,7 @@ def meets_requirements(vehicle):
         "DAIHATSU",
         "MITSUBISHI",
         "ISUZU",
-    ]
+    }
 
     max_mileage = 180000
     max_price = 20000
@@ -33,7 +34,7 @@ def meets_requirements(vehicle):
     location_jpn = ["Kobe", "Osaka", "Tokyo", "Nagoya", "Yokohama", "Fukuoka"]
 
     result = (
-        any(title in vehicle["Title"] for title in titles)
+        vehicle["Title"].split(" ")[0] in titles
         and int(vehicle["Mileage"]) <= max_mileage  # Convert to int
         and vehicle["Auction Grade"] in auction_grade
         and vehicle["Location"] in location_jpn
@@ -68,10 +69,22 @@ cursor = conn.cursor()
 
 # Query the database for vehicle data
 # cursor.execute("SELECT * FROM vehicles")  # Adjust the query as needed
-cursor.execute("SELECT * FROM vehicles WHERE sent_to_discord = 0")
+# Only available vehicles; skip relistings of a vehicle (same canonical id)
+# that was already sent
+cursor.execute(
+    """
+    SELECT v.*, COALESCE(v.canonical_id, v.ref_no) FROM vehicles v
+    WHERE v.sent_to_discord = 0 AND v.status = 'available'
+    AND NOT EXISTS (
+        SELECT 1 FROM vehicles s
+        WHERE s.canonical_id = v.canonical_id AND s.sent_to_discord = 1
+    )
+    ORDER BY v.rowid"""
+)
 vehicles = cursor.fetchall()
 
 links = []
+canonical_ids = set()
 
 
 # for _, vehicle in df.iterrows():
@@ -103,8 +116,14 @@ for vehicle in vehicles:
         "Link": vehicle[15],
     }
 
+    # Only send one listing per physical vehicle
+    canonical_id = vehicle[-1]
+    if canonical_id in canonical_ids:
+        continue
+
     if meets_requirements(vehicle_dict):
         links.append(vehicle_dict["Link"])
+        canonical_ids.add(canonical_id)
         if len(links) >= 6:
             break
 